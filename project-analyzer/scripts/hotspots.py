@@ -0,0 +1,368 @@
+"""
+基于 Git 历史的代码热点索引（hotspot index）
+
+只执行一次 git log --numstat，并以流式方式逐行解析，为每个文件和每级目录累计：
+- churn：新增行数 + 删除行数
+- commits：涉及该文件/目录的提交次数
+- recent：近期活跃度，每个提交按时间指数衰减后累加（半衰期默认 90 天）
+- authors：参与修改的作者数
+
+按提交时间从旧到新处理并跟踪文件重命名，重命名后的文件继承原路径的历史；
+输出时只保留 HEAD 中仍存在的文件和目录。
+
+索引保存在仓库的 git 目录下（<git-dir>/project-analyzer/hotspots.json），不会污染工作区。
+再次运行时只读取上次索引的 HEAD 之后的新提交进行增量更新；历史被改写时自动全量重建。
+"""
+import json
+import math
+import os
+import re
+import subprocess
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+
+INDEX_VERSION = 2
+
+# 近期活跃度的半衰期（天）
+DEFAULT_HALF_LIFE_DAYS = 90
+
+# 提交头标记，避免与 numstat 行混淆
+COMMIT_MARKER = '\x1e'
+FIELD_SEP = '\x1f'
+
+SORT_KEYS = ('recent', 'churn', 'commits', 'authors')
+
+# numstat 中的重命名路径：src/{old => new}/file.ts 或 old.ts => new.ts
+RENAME_BRACE_PATTERN = re.compile(r'^(.*)\{(.*) => (.*)\}(.*)$')
+
+
+def _git(repo_path: str, *args: str) -> Optional[str]:
+    result = subprocess.run(['git', '-C', repo_path, *args], capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def get_index_path(repo_path: str) -> str:
+    """
+    返回热点索引文件路径：<git-dir>/project-analyzer/hotspots.json
+    """
+    git_dir = _git(repo_path, 'rev-parse', '--absolute-git-dir')
+    if git_dir is None:
+        raise ValueError(f"{repo_path} 不是 Git 仓库")
+    return os.path.join(git_dir, 'project-analyzer', 'hotspots.json')
+
+
+def _new_index(half_life_days: float) -> Dict:
+    return {
+        'version': INDEX_VERSION,
+        'head': None,
+        'half_life_days': half_life_days,
+        'reference_time': int(time.time()),
+        'authors': [],
+        'files': {},
+        'dirs': {}
+    }
+
+
+def _new_entry() -> Dict:
+    return {'churn': 0, 'commits': 0, 'recent': 0.0, 'last_commit_time': 0, 'authors': []}
+
+
+def _parent_dirs(path: str) -> List[str]:
+    """
+    返回文件的所有上级目录，如 src/api/user.ts → ['src', 'src/api']
+    """
+    parts = path.split('/')[:-1]
+    return ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def _parse_numstat_path(path: str) -> Tuple[Optional[str], str]:
+    """
+    解析 numstat 的路径字段
+
+    Returns:
+        (重命名前的路径，没有重命名时为 None, 当前路径)
+    """
+    match = RENAME_BRACE_PATTERN.match(path)
+    if match:
+        prefix, old, new, suffix = match.groups()
+        return (re.sub('/+', '/', f'{prefix}{old}{suffix}'),
+                re.sub('/+', '/', f'{prefix}{new}{suffix}'))
+    if ' => ' in path:
+        old, new = path.split(' => ', 1)
+        return old, new
+    return None, path
+
+
+def _merge_entry(target: Dict, source: Dict) -> None:
+    target['churn'] += source['churn']
+    target['commits'] += source['commits']
+    target['recent'] += source['recent']
+    target['last_commit_time'] = max(target['last_commit_time'], source['last_commit_time'])
+    for author_id in source['authors']:
+        if author_id not in target['authors']:
+            target['authors'].append(author_id)
+
+
+def _decay_to(index: Dict, reference_time: int) -> None:
+    """
+    将已有的近期活跃度衰减到新的参考时间点，使增量累加的结果与全量计算一致
+    """
+    elapsed_days = (reference_time - index['reference_time']) / 86400
+    if elapsed_days <= 0:
+        return
+
+    factor = math.pow(0.5, elapsed_days / index['half_life_days'])
+    for table in (index['files'], index['dirs']):
+        for entry in table.values():
+            entry['recent'] *= factor
+    index['reference_time'] = reference_time
+
+
+def _apply_commit(index: Dict, author_ids: Dict[str, int], author: str, commit_time: int,
+                  file_churn: Dict[str, int], renames: Dict[str, str]) -> None:
+    # 重命名的文件继承原路径的历史
+    for old_path, new_path in renames.items():
+        old_entry = index['files'].pop(old_path, None)
+        if old_entry is not None:
+            _merge_entry(index['files'].setdefault(new_path, _new_entry()), old_entry)
+
+    if not file_churn:
+        return
+
+    if author not in author_ids:
+        author_ids[author] = len(index['authors'])
+        index['authors'].append(author)
+    author_id = author_ids[author]
+
+    age_days = max(index['reference_time'] - commit_time, 0) / 86400
+    weight = math.pow(0.5, age_days / index['half_life_days'])
+
+    dir_churn = defaultdict(int)
+    for path, churn in file_churn.items():
+        for dir_path in _parent_dirs(path):
+            dir_churn[dir_path] += churn
+
+    for table, changes in ((index['files'], file_churn), (index['dirs'], dir_churn)):
+        for path, churn in changes.items():
+            entry = table.setdefault(path, _new_entry())
+            # 同一提交对同一文件/目录只计一次
+            entry['churn'] += churn
+            entry['commits'] += 1
+            entry['recent'] += weight
+            entry['last_commit_time'] = max(entry['last_commit_time'], commit_time)
+            if author_id not in entry['authors']:
+                entry['authors'].append(author_id)
+
+
+def _scan_history(repo_path: str, index: Dict, revision_range: str) -> int:
+    """
+    流式读取 git log --numstat 的输出并累计到索引中
+
+    按时间从旧到新（--reverse）处理，这样遇到重命名时原路径的历史已经累计完毕，可以整体迁移到新路径
+
+    Returns:
+        处理的提交数量
+    """
+    cmd = [
+        'git', '-C', repo_path, '-c', 'core.quotePath=false', 'log', revision_range,
+        '--reverse', '--numstat', '-M', f'--format={COMMIT_MARKER}%H{FIELD_SEP}%at{FIELD_SEP}%aE'
+    ]
+
+    author_ids = {author: i for i, author in enumerate(index['authors'])}
+    commit_count = 0
+    current = None
+    file_churn = {}
+    renames = {}
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            text=True, encoding='utf-8', errors='replace')
+    try:
+        for line in proc.stdout:
+            line = line.rstrip('\n')
+            if line.startswith(COMMIT_MARKER):
+                if current is not None:
+                    _apply_commit(index, author_ids, current[1], current[0], file_churn, renames)
+                _, commit_time, author = line[1:].split(FIELD_SEP)
+                current = (int(commit_time), author.lower())
+                file_churn = {}
+                renames = {}
+                commit_count += 1
+                continue
+
+            parts = line.split('\t')
+            if len(parts) != 3:
+                continue
+            # 二进制文件的增删行数为 '-'，只计提交次数
+            additions = int(parts[0]) if parts[0].isdigit() else 0
+            deletions = int(parts[1]) if parts[1].isdigit() else 0
+            old_path, path = _parse_numstat_path(parts[2])
+            if old_path is not None:
+                renames[old_path] = path
+            file_churn[path] = file_churn.get(path, 0) + additions + deletions
+
+        if current is not None:
+            _apply_commit(index, author_ids, current[1], current[0], file_churn, renames)
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+    return commit_count
+
+
+def load_index(repo_path: str) -> Optional[Dict]:
+    """
+    读取已有的热点索引，不存在或版本不匹配时返回 None
+    """
+    index_path = get_index_path(repo_path)
+    if not os.path.exists(index_path):
+        return None
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except Exception as e:
+        print(f"⚠️ 读取热点索引失败，将重新构建: {e}")
+        return None
+
+    return index if index.get('version') == INDEX_VERSION else None
+
+
+def build_index(repo_path: str, rebuild: bool = False,
+                half_life_days: float = DEFAULT_HALF_LIFE_DAYS) -> Dict:
+    """
+    构建或增量更新热点索引并保存
+
+    Args:
+        repo_path: 仓库路径
+        rebuild: 是否忽略已有索引全量重建
+        half_life_days: 近期活跃度半衰期（天），与已有索引不一致时全量重建
+
+    Returns:
+        热点索引
+    """
+    head = _git(repo_path, 'rev-parse', 'HEAD')
+    if head is None:
+        raise ValueError(f"{repo_path} 没有任何提交")
+
+    index = None if rebuild else load_index(repo_path)
+    if index is not None and index.get('half_life_days') != half_life_days:
+        index = None
+
+    if index is not None and index['head'] == head:
+        # 没有新提交，只把近期活跃度衰减到当前时间
+        _decay_to(index, int(time.time()))
+    elif index is not None and subprocess.run(
+            ['git', '-C', repo_path, 'merge-base', '--is-ancestor', index['head'], head],
+            capture_output=True).returncode == 0:
+        _decay_to(index, int(time.time()))
+        count = _scan_history(repo_path, index, f"{index['head']}..{head}")
+        print(f"🔄 增量更新热点索引: {count} 个新提交")
+    else:
+        if index is not None:
+            print("⚠️ 上次索引的提交已不在当前历史中，全量重建热点索引")
+        index = _new_index(half_life_days)
+        count = _scan_history(repo_path, index, head)
+        print(f"🔄 构建热点索引: {count} 个提交")
+
+    index['head'] = head
+
+    index_path = get_index_path(repo_path)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    return index
+
+
+def get_tracked_paths(repo_path: str) -> Dict[str, Set[str]]:
+    """
+    返回 HEAD 中存在的文件和目录：{'files': {...}, 'dirs': {...}}
+    """
+    output = _git(repo_path, '-c', 'core.quotePath=false', 'ls-tree', '-r', '--name-only', 'HEAD') or ''
+    files = set(output.splitlines())
+    dirs = {dir_path for path in files for dir_path in _parent_dirs(path)}
+    return {'files': files, 'dirs': dirs}
+
+
+def top_hotspots(index: Dict, kind: str = 'files', path_prefix: str = '',
+                 sort_by: str = 'recent', limit: int = 20,
+                 tracked: Dict[str, Set[str]] = None) -> List[Dict]:
+    """
+    按指定指标返回热点文件或目录
+
+    Args:
+        index: 热点索引
+        kind: 'files' 或 'dirs'
+        path_prefix: 只返回该目录下的条目（模块分析模式使用），为空时返回全部
+        sort_by: 排序指标，recent / churn / commits / authors
+        limit: 返回数量
+        tracked: get_tracked_paths 的返回值，指定时只返回 HEAD 中仍存在的路径（排除已删除、已移动的路径）
+
+    Returns:
+        [{path, churn, commits, recent, authors, last_commit_time}]
+    """
+    prefix = path_prefix.strip('/')
+    if prefix:
+        prefix += '/'
+
+    rows = []
+    for path, entry in index[kind].items():
+        if prefix and not path.startswith(prefix):
+            continue
+        if tracked is not None and path not in tracked[kind]:
+            continue
+        rows.append({
+            'path': path,
+            'churn': entry['churn'],
+            'commits': entry['commits'],
+            'recent': round(entry['recent'], 2),
+            'authors': len(entry['authors']),
+            'last_commit_time': entry['last_commit_time']
+        })
+
+    rows.sort(key=lambda row: (row[sort_by], row['churn']), reverse=True)
+    return rows[:limit]
+
+
+def format_hotspot_table(rows: List[Dict]) -> str:
+    """
+    将热点列表格式化为 Markdown 表格
+    """
+    lines = [
+        '| 路径 | 近期活跃度 | 提交次数 | 改动行数 | 作者数 | 最近修改 |',
+        '|------|-----------|---------|---------|-------|---------|'
+    ]
+    for row in rows:
+        last = time.strftime('%Y-%m-%d', time.localtime(row['last_commit_time']))
+        lines.append(f"| {row['path']} | {row['recent']} | {row['commits']} | {row['churn']} "
+                     f"| {row['authors']} | {last} |")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='构建/更新代码热点索引并输出热点文件和目录')
+    parser.add_argument('repo_path', help='仓库路径')
+    parser.add_argument('--path', default='', help='只输出该目录下的热点（模块分析模式），相对仓库根目录')
+    parser.add_argument('--sort', choices=SORT_KEYS, default='recent', help='排序指标，默认 recent')
+    parser.add_argument('--top', type=int, default=20, help='输出数量，默认 20')
+    parser.add_argument('--rebuild', action='store_true', help='忽略已有索引全量重建')
+    parser.add_argument('--half-life', type=float, default=DEFAULT_HALF_LIFE_DAYS,
+                        help=f'近期活跃度半衰期（天），默认 {DEFAULT_HALF_LIFE_DAYS}')
+    args = parser.parse_args()
+
+    try:
+        index = build_index(args.repo_path, args.rebuild, args.half_life)
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+
+    tracked = get_tracked_paths(args.repo_path)
+    scope = args.path or '整个项目'
+    print(f"\n## 热点目录（{scope}）\n")
+    print(format_hotspot_table(top_hotspots(index, 'dirs', args.path, args.sort, args.top, tracked)))
+    print(f"\n## 热点文件（{scope}）\n")
+    print(format_hotspot_table(top_hotspots(index, 'files', args.path, args.sort, args.top, tracked)))
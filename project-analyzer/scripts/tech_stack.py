@@ -0,0 +1,825 @@
+"""
+技术栈识别：依赖清单（manifest）与锁文件（lockfile）解析
+
+- 一次目录遍历找出项目中所有 manifest 和 lockfile（跳过 node_modules、.git 等目录）
+- 多线程计算内容哈希，未命中缓存的文件用多进程并行解析；锁文件按行流式读取，不整体加载到内存
+- 用锁文件解析出实际安装的版本，与 manifest 中声明的版本范围对应
+- 解析结果按文件内容哈希缓存，文件未变化时直接复用；最终输出去重后的技术栈表
+
+缓存位置：~/.cache/project-analyzer/tech_stack-<项目路径哈希>.json（可通过 --cache 指定）
+"""
+import hashlib
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+CACHE_VERSION = 2
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'project-analyzer')
+
+# 遍历时跳过的目录
+SKIP_DIRS = {
+    '.git', '.svn', '.hg', 'node_modules', 'bower_components', '.venv', 'venv', 'env',
+    '__pycache__', '.tox', '.nox', '.mypy_cache', '.pytest_cache', 'dist', 'build',
+    'target', 'vendor', '.idea', '.vscode', '.next', '.nuxt', 'coverage'
+}
+
+# 文件名 → (生态, 类型)
+MANIFEST_FILES = {
+    'package.json': ('npm', 'manifest'),
+    'pyproject.toml': ('pypi', 'manifest'),
+    'Pipfile': ('pypi', 'manifest'),
+    'pom.xml': ('maven', 'manifest'),
+    'build.gradle': ('maven', 'manifest'),
+    'build.gradle.kts': ('maven', 'manifest'),
+    'go.mod': ('go', 'manifest'),
+    'Cargo.toml': ('cargo', 'manifest'),
+    'package-lock.json': ('npm', 'lockfile'),
+    'npm-shrinkwrap.json': ('npm', 'lockfile'),
+    'yarn.lock': ('npm', 'lockfile'),
+    'pnpm-lock.yaml': ('npm', 'lockfile'),
+    'poetry.lock': ('pypi', 'lockfile'),
+    'Pipfile.lock': ('pypi', 'lockfile'),
+    'Cargo.lock': ('cargo', 'lockfile'),
+}
+
+REQUIREMENTS_PATTERN = re.compile(r'^requirements([-_.\w]*)\.txt$')
+
+# 常见技术 → 类别，用于技术栈表中的"类别"列
+KNOWN_TECH = {
+    'vue': '框架', 'react': '框架', 'react-dom': '框架', '@angular/core': '框架', 'svelte': '框架',
+    'next': '框架', 'nuxt': '框架', '@tarojs/taro': '框架', 'express': '框架', 'koa': '框架',
+    '@nestjs/core': '框架', 'django': '框架', 'flask': '框架', 'fastapi': '框架',
+    'org.springframework.boot:spring-boot-starter-web': '框架', 'github.com/gin-gonic/gin': '框架',
+    'actix-web': '框架',
+    'vuex': '状态管理', 'pinia': '状态管理', 'redux': '状态管理', '@reduxjs/toolkit': '状态管理',
+    'mobx': '状态管理', 'zustand': '状态管理', 'recoil': '状态管理',
+    'vue-router': '路由', 'react-router': '路由', 'react-router-dom': '路由',
+    'element-ui': 'UI组件库', 'element-plus': 'UI组件库', 'antd': 'UI组件库', 'ant-design-vue': 'UI组件库',
+    'vant': 'UI组件库', '@mui/material': 'UI组件库', 'naive-ui': 'UI组件库',
+    'webpack': '构建工具', 'vite': '构建工具', 'rollup': '构建工具', 'umi': '构建工具', 'esbuild': '构建工具',
+    'axios': 'HTTP客户端', 'requests': 'HTTP客户端', 'httpx': 'HTTP客户端',
+    'sass': 'CSS预处理', 'node-sass': 'CSS预处理', 'less': 'CSS预处理', 'stylus': 'CSS预处理',
+    'tailwindcss': 'CSS预处理',
+    'eslint': '代码规范', 'prettier': '代码规范', 'stylelint': '代码规范',
+    'typescript': '语言', 'go': '语言',
+}
+
+
+# ---------------------------------------------------------------------------
+# 目录遍历与哈希
+# ---------------------------------------------------------------------------
+
+def find_manifests(root: str) -> List[Tuple[str, str, str]]:
+    """
+    一次遍历找出所有 manifest 和 lockfile
+
+    Returns:
+        [(相对路径, 生态, 类型)]
+    """
+    found = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = [d for d in dir_names if d not in SKIP_DIRS and not d.startswith('.')]
+        for file_name in file_names:
+            if file_name in MANIFEST_FILES:
+                ecosystem, kind = MANIFEST_FILES[file_name]
+            elif REQUIREMENTS_PATTERN.match(file_name):
+                ecosystem, kind = 'pypi', 'manifest'
+            else:
+                continue
+            rel_path = os.path.relpath(os.path.join(dir_path, file_name), root).replace(os.sep, '/')
+            found.append((rel_path, ecosystem, kind))
+    return sorted(found)
+
+
+def file_hash(path: str) -> str:
+    """
+    分块计算文件内容的 sha256，不整体读入内存
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# manifest 解析（文件较小，整体读取）
+# 返回 {'dependencies': {name: 声明版本}, 'dev_dependencies': {...}}；
+# 能直接确定实际版本的（固定版本、go.mod 等）额外返回 'resolved': {name: 版本}
+# ---------------------------------------------------------------------------
+
+def _load_toml(path: str) -> Optional[Dict]:
+    if tomllib is None:
+        return None
+    with open(path, 'rb') as f:
+        return tomllib.load(f)
+
+
+def _parse_toml_tables(path: str, tables: List[str]) -> Dict[str, str]:
+    """
+    tomllib 不可用时的简易解析：读取指定表中 name = "version" 形式的条目
+    """
+    deps = {}
+    current = None
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('['):
+                current = line.strip('[]').strip()
+                continue
+            if current in tables and '=' in line and not line.startswith('#'):
+                name, _, value = line.partition('=')
+                match = re.search(r'"([^"]*)"', value)
+                deps[name.strip().strip('"')] = match.group(1) if match else value.strip()
+    return deps
+
+
+def _toml_version(spec) -> str:
+    if isinstance(spec, dict):
+        return str(spec.get('version', spec.get('git', spec.get('path', '*'))))
+    return str(spec)
+
+
+def normalize_name(ecosystem: str, name: str) -> str:
+    """
+    规范化依赖名称：PyPI 名称不区分大小写，且 '-'、'_'、'.' 等价（PEP 503）
+    """
+    if ecosystem == 'pypi':
+        return re.sub(r'[-_.]+', '-', name).lower()
+    return name
+
+
+def _split_requirement(requirement: str) -> Tuple[Optional[str], str]:
+    """
+    拆分 PEP 508 依赖声明，如 'django>=4.2; python_version>"3.8"' → ('django', '>=4.2')
+    """
+    requirement = requirement.split(';')[0].split('#')[0].strip()
+    match = re.match(r'^([A-Za-z0-9][A-Za-z0-9._-]*)(\[[^\]]*\])?\s*(.*)$', requirement)
+    if not match:
+        return None, ''
+    return match.group(1), match.group(3).strip() or '*'
+
+
+def parse_package_json(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {
+        'dependencies': {**data.get('peerDependencies', {}), **data.get('dependencies', {})},
+        'dev_dependencies': data.get('devDependencies', {}),
+    }
+
+
+def parse_requirements(path: str) -> Dict:
+    deps, resolved = {}, {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(('#', '-')):
+                continue
+            name, spec = _split_requirement(line)
+            if name:
+                deps[name] = spec
+                # == 固定的版本即实际安装版本
+                if spec.startswith('==') and ',' not in spec:
+                    resolved[name] = spec[2:].strip()
+    return {'dependencies': deps, 'dev_dependencies': {}, 'resolved': resolved}
+
+
+def parse_pyproject(path: str) -> Dict:
+    data = _load_toml(path)
+    if data is None:
+        deps = _parse_toml_tables(path, ['tool.poetry.dependencies'])
+        deps.pop('python', None)
+        return {
+            'dependencies': deps,
+            'dev_dependencies': _parse_toml_tables(path, ['tool.poetry.dev-dependencies',
+                                                          'tool.poetry.group.dev.dependencies']),
+        }
+
+    deps, dev_deps = {}, {}
+    project = data.get('project', {})
+    for requirement in project.get('dependencies', []):
+        name, spec = _split_requirement(requirement)
+        if name:
+            deps[name] = spec
+    for requirements in project.get('optional-dependencies', {}).values():
+        for requirement in requirements:
+            name, spec = _split_requirement(requirement)
+            if name:
+                dev_deps[name] = spec
+
+    poetry = data.get('tool', {}).get('poetry', {})
+    for name, spec in poetry.get('dependencies', {}).items():
+        deps[name] = _toml_version(spec)
+    for name, spec in poetry.get('dev-dependencies', {}).items():
+        dev_deps[name] = _toml_version(spec)
+    for group in poetry.get('group', {}).values():
+        for name, spec in group.get('dependencies', {}).items():
+            dev_deps[name] = _toml_version(spec)
+
+    deps.pop('python', None)
+    return {'dependencies': deps, 'dev_dependencies': dev_deps}
+
+
+def parse_pipfile(path: str) -> Dict:
+    data = _load_toml(path)
+    if data is None:
+        return {
+            'dependencies': _parse_toml_tables(path, ['packages']),
+            'dev_dependencies': _parse_toml_tables(path, ['dev-packages']),
+        }
+    return {
+        'dependencies': {name: _toml_version(spec) for name, spec in data.get('packages', {}).items()},
+        'dev_dependencies': {name: _toml_version(spec) for name, spec in data.get('dev-packages', {}).items()},
+    }
+
+
+def parse_cargo_toml(path: str) -> Dict:
+    data = _load_toml(path)
+    if data is None:
+        return {
+            'dependencies': _parse_toml_tables(path, ['dependencies', 'workspace.dependencies']),
+            'dev_dependencies': _parse_toml_tables(path, ['dev-dependencies']),
+        }
+    deps = dict(data.get('workspace', {}).get('dependencies', {}))
+    deps.update(data.get('dependencies', {}))
+    return {
+        'dependencies': {name: _toml_version(spec) for name, spec in deps.items()},
+        'dev_dependencies': {name: _toml_version(spec) for name, spec in data.get('dev-dependencies', {}).items()},
+    }
+
+
+def parse_go_mod(path: str) -> Dict:
+    # go.mod 中的版本即最小版本选择后的实际版本
+    deps = {}
+    in_require = False
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.split('//')[0].strip()
+            if line.startswith('go ') and not in_require:
+                deps['go'] = line.split()[1]
+            elif line.startswith('require ('):
+                in_require = True
+            elif in_require and line == ')':
+                in_require = False
+            elif in_require or line.startswith('require '):
+                parts = line.replace('require ', '', 1).split()
+                if len(parts) >= 2:
+                    deps[parts[0]] = parts[1]
+    return {'dependencies': deps, 'dev_dependencies': {}, 'resolved': dict(deps)}
+
+
+def parse_pom(path: str) -> Dict:
+    tree = ET.parse(path)
+    root = tree.getroot()
+    ns = {'m': root.tag[1:root.tag.index('}')]} if root.tag.startswith('{') else {}
+    prefix = 'm:' if ns else ''
+
+    properties = {}
+    props = root.find(f'{prefix}properties', ns)
+    if props is not None:
+        for prop in props:
+            properties[prop.tag.split('}')[-1]] = (prop.text or '').strip()
+    project_version = root.findtext(f'{prefix}version', default='', namespaces=ns).strip()
+    properties.setdefault('project.version', project_version)
+
+    def resolve(value: str) -> str:
+        return re.sub(r'\$\{([^}]+)\}', lambda m: properties.get(m.group(1), m.group(0)), value)
+
+    deps, dev_deps = {}, {}
+    parent = root.find(f'{prefix}parent', ns)
+    if parent is not None:
+        name = f"{parent.findtext(f'{prefix}groupId', '', ns)}:{parent.findtext(f'{prefix}artifactId', '', ns)}"
+        deps[name] = resolve(parent.findtext(f'{prefix}version', '', ns).strip())
+
+    # 只读取 project/dependencies 下的直接依赖，不包含 dependencyManagement 和插件依赖
+    for dep in root.findall(f'{prefix}dependencies/{prefix}dependency', ns):
+        group_id = dep.findtext(f'{prefix}groupId', '', ns).strip()
+        artifact_id = dep.findtext(f'{prefix}artifactId', '', ns).strip()
+        version = resolve(dep.findtext(f'{prefix}version', '', ns).strip()) or '*'
+        scope = dep.findtext(f'{prefix}scope', '', ns).strip()
+        (dev_deps if scope == 'test' else deps)[f'{group_id}:{artifact_id}'] = version
+
+    # dependencyManagement 中的版本只用于解析本模块及子模块中未写版本的依赖
+    managed = {}
+    for dep in root.findall(f'{prefix}dependencyManagement/{prefix}dependencies/{prefix}dependency', ns):
+        group_id = dep.findtext(f'{prefix}groupId', '', ns).strip()
+        artifact_id = dep.findtext(f'{prefix}artifactId', '', ns).strip()
+        version = resolve(dep.findtext(f'{prefix}version', '', ns).strip())
+        if version:
+            managed[f'{group_id}:{artifact_id}'] = version
+
+    # Maven 没有锁文件，显式声明（属性已替换）的版本即实际版本；
+    # 未写版本或引用了父 pom 属性的依赖在 build_tech_stack 中沿目录向上查找父 pom 解析
+    resolved = {name: version for name, version in {**deps, **dev_deps}.items()
+                if version != '*' and '${' not in version}
+    return {'dependencies': deps, 'dev_dependencies': dev_deps, 'resolved': resolved,
+            'managed': managed, 'properties': properties}
+
+
+def parse_gradle(path: str) -> Dict:
+    deps, dev_deps = {}, {}
+    # 版本号可省略（由 BOM / platform / 版本目录管理），此时与 parse_pom 一致记为 '*'
+    pattern = re.compile(r'''^\s*(\w+)\s*\(?\s*['"]([^:'"]+):([^:'"]+)(?::([^'"]+))?['"]''')
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = pattern.match(line)
+            if match:
+                configuration, group_id, artifact_id, version = match.groups()
+                target = dev_deps if configuration.lower().startswith('test') else deps
+                target[f'{group_id}:{artifact_id}'] = version or '*'
+    resolved = {name: version for name, version in {**deps, **dev_deps}.items()
+                if version != '*' and '$' not in version}
+    return {'dependencies': deps, 'dev_dependencies': dev_deps, 'resolved': resolved}
+
+
+# ---------------------------------------------------------------------------
+# lockfile 解析（按行流式读取）
+# 返回 {'packages': {key: 实际版本}}，key 的含义因锁文件格式而异
+# ---------------------------------------------------------------------------
+
+def parse_package_lock(path: str) -> Dict:
+    """
+    package-lock.json / npm-shrinkwrap.json
+
+    依赖 npm 固定的两空格缩进格式逐行解析：
+    - v2/v3：packages 中 "node_modules/<name>"（含嵌套/工作区路径）→ version，key 为完整路径
+    - v1：顶层 dependencies 中 "<name>" → version，key 为 node_modules/<name>
+    """
+    packages = {}
+    entry_pattern = re.compile(r'^\s*"((?:[^"]*/)?node_modules/[^"]+)": \{\s*$')
+    legacy_entry_pattern = re.compile(r'^    "([^"]+)": \{\s*$')
+    version_pattern = re.compile(r'^\s*"version": "([^"]+)"')
+
+    current = None
+    in_legacy_deps = False
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if line.startswith('  "'):
+                in_legacy_deps = line.startswith('  "dependencies": {')
+                current = None
+                continue
+
+            match = entry_pattern.match(line)
+            if match:
+                current = match.group(1)
+                continue
+            if in_legacy_deps:
+                match = legacy_entry_pattern.match(line)
+                if match:
+                    current = f'node_modules/{match.group(1)}'
+                    continue
+
+            if current is not None:
+                match = version_pattern.match(line)
+                if match:
+                    # v2 同时包含 packages 和 legacy dependencies，以 packages 为准
+                    packages.setdefault(current, match.group(1))
+                    current = None
+    return {'packages': packages}
+
+
+def parse_yarn_lock(path: str) -> Dict:
+    """
+    yarn.lock（v1 与 berry），key 为 "<name>@<声明范围>"
+    """
+    packages = {}
+    specs = []
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if not line.strip() or line.startswith('#'):
+                continue
+            if not line[0].isspace():
+                specs = [spec.strip().strip('"') for spec in line.rstrip().rstrip(':').split(',')]
+                continue
+            stripped = line.strip()
+            if specs and stripped.startswith('version'):
+                version = stripped[len('version'):].lstrip(': ').strip().strip('"')
+                for spec in specs:
+                    # berry 格式：name@npm:^1.0.0
+                    packages[spec.replace('@npm:', '@', 1)] = version
+                specs = []
+    return {'packages': packages}
+
+
+def parse_pnpm_lock(path: str) -> Dict:
+    """
+    pnpm-lock.yaml，key 为 "<importer 目录>|<name>"；单项目（无 importers）时 importer 为 "."
+    """
+    packages = {}
+    importer = '.'
+    section = None
+    current_name = None
+    in_importers = False
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            indent = len(line) - len(line.lstrip(' '))
+            stripped = line.strip()
+            # 依赖分组（dependencies 等）的缩进：有 importers 时位于 importer 之下
+            base = 4 if in_importers else 0
+
+            if indent == 0:
+                in_importers = stripped == 'importers:'
+                section = stripped.rstrip(':') if not in_importers else None
+                importer = '.'
+                continue
+
+            if in_importers and indent == 2:
+                importer = stripped.rstrip(':').strip("'\"")
+                section = None
+                continue
+
+            if indent == base:
+                section = stripped.rstrip(':')
+                continue
+            if section not in ('dependencies', 'devDependencies', 'optionalDependencies'):
+                continue
+
+            key, _, value = stripped.partition(':')
+            key = key.strip().strip("'\"")
+            value = value.strip().strip("'\"")
+            if indent == base + 2:
+                current_name = key
+                if value:
+                    # v5：name: 1.2.3
+                    packages[f'{importer}|{key}'] = value.split('(')[0].split('_')[0]
+            elif indent == base + 4 and key == 'version' and current_name:
+                # v6+：name:\n  specifier: ^1.0.0\n  version: 1.2.3(peer@x)
+                packages[f'{importer}|{current_name}'] = value.split('(')[0]
+    return {'packages': packages}
+
+
+def parse_toml_lock(path: str) -> Dict:
+    """
+    poetry.lock / Cargo.lock：[[package]] 块中的 name 与 version
+    """
+    packages = {}
+    name = None
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped == '[[package]]':
+                name = None
+            elif stripped.startswith('name = '):
+                name = stripped.split('=', 1)[1].strip().strip('"')
+            elif stripped.startswith('version = ') and name:
+                packages.setdefault(name.lower(), stripped.split('=', 1)[1].strip().strip('"'))
+                name = None
+    return {'packages': packages}
+
+
+def parse_pipfile_lock(path: str) -> Dict:
+    """
+    Pipfile.lock：default / develop 中 "<name>": {... "version": "==1.2.3"}
+    """
+    packages = {}
+    entry_pattern = re.compile(r'^        "([^"]+)": \{\s*$')
+    version_pattern = re.compile(r'^\s*"version": "==([^"]+)"')
+    current = None
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = entry_pattern.match(line)
+            if match:
+                current = match.group(1).lower()
+                continue
+            match = version_pattern.match(line)
+            if match and current:
+                packages.setdefault(current, match.group(1))
+                current = None
+    return {'packages': packages}
+
+
+PARSERS = {
+    'package.json': parse_package_json,
+    'pyproject.toml': parse_pyproject,
+    'Pipfile': parse_pipfile,
+    'pom.xml': parse_pom,
+    'build.gradle': parse_gradle,
+    'build.gradle.kts': parse_gradle,
+    'go.mod': parse_go_mod,
+    'Cargo.toml': parse_cargo_toml,
+    'package-lock.json': parse_package_lock,
+    'npm-shrinkwrap.json': parse_package_lock,
+    'yarn.lock': parse_yarn_lock,
+    'pnpm-lock.yaml': parse_pnpm_lock,
+    'poetry.lock': parse_toml_lock,
+    'Pipfile.lock': parse_pipfile_lock,
+    'Cargo.lock': parse_toml_lock,
+}
+
+
+def _get_parser(rel_path: str):
+    file_name = rel_path.rsplit('/', 1)[-1]
+    return PARSERS.get(file_name, parse_requirements)
+
+
+# ---------------------------------------------------------------------------
+# 缓存与并行解析
+# ---------------------------------------------------------------------------
+
+def default_cache_file(root: str) -> str:
+    """
+    每个项目一个缓存文件，按项目绝对路径区分
+    """
+    project_id = hashlib.sha1(os.path.abspath(root).encode()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f'tech_stack-{project_id}.json')
+
+
+def load_cache(cache_file: str) -> Dict:
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == CACHE_VERSION:
+                return cache
+        except Exception as e:
+            print(f"⚠️ 读取技术栈缓存失败，将重新解析: {e}")
+    return {'version': CACHE_VERSION, 'files': {}, 'tables': {}}
+
+
+def save_cache(cache: Dict, cache_file: str) -> None:
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def _cache_key(root: str, rel_path: str) -> Optional[str]:
+    """
+    计算缓存 key："<文件名>:<内容哈希>"；文件无法读取（如失效的软链接）时返回 None
+    """
+    try:
+        return f"{rel_path.rsplit('/', 1)[-1]}:{file_hash(os.path.join(root, rel_path))}"
+    except Exception as e:
+        print(f"⚠️ 读取 {rel_path} 失败，已跳过: {e}")
+        return None
+
+
+def _parse_file(root: str, rel_path: str) -> Dict:
+    """
+    解析单个文件，在子进程中执行
+    """
+    try:
+        return _get_parser(rel_path)(os.path.join(root, rel_path))
+    except Exception as e:
+        print(f"⚠️ 解析 {rel_path} 失败: {e}")
+        return {'dependencies': {}, 'dev_dependencies': {}, 'packages': {}}
+
+
+def _parse_files(root: str, rel_paths: List[str], workers: int) -> List[Dict]:
+    """
+    解析未命中缓存的文件：解析器是纯 Python 的逐行/正则处理，受 GIL 限制，
+    因此多个文件时使用多进程并行；进程池不可用时退回顺序解析
+    """
+    if len(rel_paths) > 1 and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(rel_paths))) as executor:
+                return list(executor.map(_parse_file, [root] * len(rel_paths), rel_paths))
+        except (OSError, NotImplementedError) as e:
+            print(f"⚠️ 无法启动多进程解析，改为顺序解析: {e}")
+    return [_parse_file(root, rel_path) for rel_path in rel_paths]
+
+
+# ---------------------------------------------------------------------------
+# 版本解析与技术栈表
+# ---------------------------------------------------------------------------
+
+def _find_lockfiles(manifest_path: str, ecosystem: str, lockfiles: Dict[str, Tuple[str, Dict]]) -> List[Tuple[str, Dict]]:
+    """
+    从 manifest 所在目录向上查找同一生态的锁文件（支持 monorepo 根目录的共享锁文件）
+    """
+    found = []
+    dir_path = manifest_path.rsplit('/', 1)[0] if '/' in manifest_path else ''
+    while True:
+        for lock_path, (lock_ecosystem, parsed) in lockfiles.items():
+            lock_dir = lock_path.rsplit('/', 1)[0] if '/' in lock_path else ''
+            if lock_dir == dir_path and lock_ecosystem == ecosystem:
+                found.append((lock_path, parsed))
+        if found or not dir_path:
+            return found
+        dir_path = dir_path.rsplit('/', 1)[0] if '/' in dir_path else ''
+
+
+def _resolve_version(name: str, declared: str, manifest_path: str,
+                     lock_path: str, packages: Dict[str, str]) -> Optional[str]:
+    file_name = lock_path.rsplit('/', 1)[-1]
+    manifest_dir = manifest_path.rsplit('/', 1)[0] if '/' in manifest_path else ''
+    lock_dir = lock_path.rsplit('/', 1)[0] if '/' in lock_path else ''
+    relative_dir = manifest_dir[len(lock_dir):].lstrip('/') if manifest_dir.startswith(lock_dir) else manifest_dir
+
+    if file_name in ('package-lock.json', 'npm-shrinkwrap.json'):
+        nested = f'{relative_dir}/node_modules/{name}' if relative_dir else None
+        return packages.get(nested) or packages.get(f'node_modules/{name}')
+    if file_name == 'yarn.lock':
+        exact = packages.get(f'{name}@{declared}')
+        if exact:
+            return exact
+        candidates = [version for spec, version in packages.items() if spec.rsplit('@', 1)[0] == name]
+        return candidates[0] if len(set(candidates)) == 1 else None
+    if file_name == 'pnpm-lock.yaml':
+        return packages.get(f"{relative_dir or '.'}|{name}")
+    return packages.get(normalize_name('pypi', name)) or packages.get(name.lower())
+
+
+def _find_parent_poms(manifest_path: str, poms: Dict[str, Dict]) -> List[Dict]:
+    """
+    返回 pom.xml 自身及其所在目录之上各级目录中的 pom.xml 解析结果（由近到远），
+    用于解析子模块中未写版本（由父 pom 的 dependencyManagement 管理）或引用父 pom 属性的依赖
+    """
+    chain = []
+    dir_path = manifest_path.rsplit('/', 1)[0] if '/' in manifest_path else ''
+    while True:
+        pom_path = f'{dir_path}/pom.xml' if dir_path else 'pom.xml'
+        if pom_path in poms:
+            chain.append(poms[pom_path])
+        if not dir_path:
+            return chain
+        dir_path = dir_path.rsplit('/', 1)[0] if '/' in dir_path else ''
+
+
+def _resolve_pom_version(name: str, declared: str, pom_chain: List[Dict]) -> Optional[str]:
+    properties = {}
+    managed = {}
+    # 越近的 pom 优先级越高
+    for pom in reversed(pom_chain):
+        properties.update(pom.get('properties', {}))
+        managed.update(pom.get('managed', {}))
+
+    version = managed.get(name) if declared == '*' else declared
+    if not version:
+        return None
+    version = re.sub(r'\$\{([^}]+)\}', lambda m: properties.get(m.group(1), m.group(0)), version)
+    return None if '${' in version else version
+
+
+def build_tech_stack(parsed_files: Dict[str, Tuple[str, str, Dict]]) -> List[Dict]:
+    """
+    合并所有 manifest 的声明依赖与锁文件中的实际版本，并按 (生态, 名称, 版本) 去重
+
+    Args:
+        parsed_files: {相对路径: (生态, 类型, 解析结果)}
+
+    Returns:
+        [{category, ecosystem, name, declared, version, dev, manifests}]
+    """
+    lockfiles = {}
+    for path, (ecosystem, kind, parsed) in parsed_files.items():
+        if kind != 'lockfile':
+            continue
+        if ecosystem == 'pypi':
+            packages = {normalize_name(ecosystem, name): version
+                        for name, version in parsed.get('packages', {}).items()}
+            parsed = {**parsed, 'packages': packages}
+        lockfiles[path] = (ecosystem, parsed)
+    poms = {path: parsed for path, (ecosystem, kind, parsed) in parsed_files.items()
+            if path.rsplit('/', 1)[-1] == 'pom.xml'}
+
+    rows = {}
+    for manifest_path, (ecosystem, kind, parsed) in parsed_files.items():
+        if kind != 'manifest':
+            continue
+        manifest_lockfiles = _find_lockfiles(manifest_path, ecosystem, lockfiles)
+        resolved = parsed.get('resolved', {})
+        pom_chain = _find_parent_poms(manifest_path, poms) if manifest_path.rsplit('/', 1)[-1] == 'pom.xml' else []
+
+        for dev, deps in ((False, parsed.get('dependencies', {})), (True, parsed.get('dev_dependencies', {}))):
+            for name, declared in deps.items():
+                version = resolved.get(name)
+                if version is None and pom_chain:
+                    version = _resolve_pom_version(name, declared, pom_chain)
+                for lock_path, lock_parsed in manifest_lockfiles:
+                    version = version or _resolve_version(name, declared, manifest_path, lock_path,
+                                                          lock_parsed.get('packages', {}))
+
+                normalized = normalize_name(ecosystem, name)
+                key = (ecosystem, normalized, version or declared)
+                row = rows.get(key)
+                if row is None:
+                    row = rows[key] = {
+                        'category': KNOWN_TECH.get(normalized, '依赖'),
+                        'ecosystem': ecosystem,
+                        'name': name,
+                        'declared': declared,
+                        'version': version,
+                        'dev': dev,
+                        'manifests': []
+                    }
+                # 任一 manifest 作为运行时依赖声明即视为运行时依赖
+                row['dev'] = row['dev'] and dev
+                row['manifests'].append(manifest_path)
+
+    category_order = {category: i for i, category in enumerate(dict.fromkeys(KNOWN_TECH.values()))}
+    return sorted(rows.values(), key=lambda row: (category_order.get(row['category'], len(category_order)),
+                                                  row['dev'], row['ecosystem'], row['name']))
+
+
+def detect_tech_stack(root: str, cache_file: str = None, workers: int = None) -> List[Dict]:
+    """
+    识别项目技术栈
+
+    Args:
+        root: 项目根目录
+        cache_file: 缓存文件路径，默认见 default_cache_file
+        workers: 并行哈希线程数与解析进程数，默认 min(8, CPU 数)
+
+    Returns:
+        去重后的技术栈列表，见 build_tech_stack
+    """
+    root = os.path.abspath(root)
+    manifests = find_manifests(root)
+    if not manifests:
+        return []
+
+    cache_file = cache_file or default_cache_file(root)
+    cache = load_cache(cache_file)
+    workers = workers or min(8, os.cpu_count() or 1)
+
+    # 计算内容哈希（I/O 与 hashlib 均释放 GIL，适合多线程）
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        keys = list(executor.map(lambda item: _cache_key(root, item[0]), manifests))
+    manifests = [(manifest, key) for manifest, key in zip(manifests, keys) if key is not None]
+
+    # 未命中缓存的文件用多进程解析
+    key_by_path = {rel_path: key for (rel_path, _, _), key in manifests}
+    misses = [rel_path for rel_path, key in key_by_path.items() if key not in cache['files']]
+    for rel_path, parsed in zip(misses, _parse_files(root, misses, workers)):
+        cache['files'][key_by_path[rel_path]] = parsed
+
+    parsed_files = {}
+    file_keys = []
+    for (rel_path, ecosystem, kind), key in manifests:
+        parsed_files[rel_path] = (ecosystem, kind, cache['files'][key])
+        file_keys.append(f'{rel_path}={key}')
+    cache_hits = len(manifests) - len(misses)
+
+    print(f"📦 找到 {len(manifests)} 个依赖文件，缓存命中 {cache_hits} 个")
+
+    # 所有文件路径与内容哈希都未变化时，直接复用上次的技术栈表
+    table_key = hashlib.sha256('\n'.join(file_keys).encode()).hexdigest()
+    table = cache['tables'].get(table_key)
+    if table is None:
+        table = build_tech_stack(parsed_files)
+        cache['tables'] = {table_key: table}
+
+    # 只保留当前仍在使用的文件缓存，避免缓存无限增长
+    if misses:
+        used = set(key_by_path.values())
+        cache['files'] = {key: value for key, value in cache['files'].items() if key in used}
+    save_cache(cache, cache_file)
+
+    return table
+
+
+def format_tech_stack_table(table: List[Dict], include_all: bool = False) -> str:
+    """
+    格式化为 SKILL.md 维度2 的技术栈表格；默认只输出已知类别的技术
+    """
+    lines = [
+        '| 类别 | 技术选型 | 版本 | 声明版本 | 来源 |',
+        '|------|---------|------|---------|------|'
+    ]
+    for row in table:
+        if not include_all and row['category'] == '依赖':
+            continue
+        sources = ', '.join(sorted(set(row['manifests']))[:3])
+        if len(set(row['manifests'])) > 3:
+            sources += f" 等 {len(set(row['manifests']))} 处"
+        name = f"{row['name']}（dev）" if row['dev'] else row['name']
+        lines.append(f"| {row['category']} | {name} | {row['version'] or '-'} | {row['declared']} | {sources} |")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='解析依赖清单与锁文件，输出项目技术栈及实际版本')
+    parser.add_argument('project_path', help='项目路径')
+    parser.add_argument('--all', action='store_true', help='输出全部依赖（默认只输出已知类别的核心技术）')
+    parser.add_argument('--json', dest='json_output', default=None, help='将完整技术栈表写入指定 JSON 文件')
+    parser.add_argument('--cache', default=None, help=f'缓存文件路径，默认位于 {CACHE_DIR}')
+    parser.add_argument('--workers', type=int, default=None, help='并行哈希线程数与解析进程数')
+    args = parser.parse_args()
+
+    tech_stack = detect_tech_stack(args.project_path, args.cache, args.workers)
+    if not tech_stack:
+        print("❌ 未找到任何依赖清单文件")
+        raise SystemExit(1)
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(tech_stack, f, ensure_ascii=False, indent=2)
+        print(f"✅ 技术栈表已保存到: {args.json_output}")
+
+    print(format_tech_stack_table(tech_stack, args.all))
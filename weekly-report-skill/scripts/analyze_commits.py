@@ -1,8 +1,10 @@
 import json
+import os
 import re
 from typing import List, Dict, Optional
 from collections import defaultdict
 from pathlib import Path
+from datetime import datetime
 
 
 # 工作类型分类规则（基于 CLASSIFICATION.md）
@@ -430,8 +432,8 @@ def extract_commit_diff(commit: Dict, repo_path: str = None) -> List[Dict]:
         return diff_info
 
     try:
-        # 获取该commit的diff信息
-        cmd = ['git', '-C', repo_path, 'show', '--stat', '--format=', commit_hash]
+        # 获取该commit的diff信息（numstat 给出准确的增删行数和完整路径）
+        cmd = ['git', '-C', repo_path, 'show', '--numstat', '--format=', commit_hash]
         stat_result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
 
         # 获取详细的diff内容
@@ -439,26 +441,24 @@ def extract_commit_diff(commit: Dict, repo_path: str = None) -> List[Dict]:
         diff_result = subprocess.run(diff_cmd, capture_output=True, text=True, timeout=15)
 
         if stat_result.returncode == 0 and diff_result.returncode == 0:
-            # 解析stat信息
+            # 解析numstat信息：<新增行数>\t<删除行数>\t<文件路径>
             stat_lines = stat_result.stdout.strip().split('\n')
             file_changes = {}
 
             for line in stat_lines:
-                if '|' in line and ('+' in line or '-' in line):
-                    parts = line.split('|')
-                    if len(parts) >= 2:
-                        file_path = parts[0].strip()
-                        changes = parts[1].strip()
-
-                        # 解析添加和删除的行数
-                        additions = changes.count('+')
-                        deletions = changes.count('-')
-
-                        file_changes[file_path] = {
-                            'additions': additions,
-                            'deletions': deletions,
-                            'changes': changes
-                        }
+                parts = line.split('\t')
+                if len(parts) >= 3:
+                    file_path = parts[2].strip()
+
+                    # 二进制文件的增删行数为 '-'
+                    additions = int(parts[0]) if parts[0].isdigit() else 0
+                    deletions = int(parts[1]) if parts[1].isdigit() else 0
+
+                    file_changes[file_path] = {
+                        'additions': additions,
+                        'deletions': deletions,
+                        'changes': f"+{additions} -{deletions}"
+                    }
 
             # 解析diff内容
             diff_content = diff_result.stdout
@@ -514,88 +514,104 @@ def extract_commit_diff(commit: Dict, repo_path: str = None) -> List[Dict]:
     return diff_info
 
 
-if __name__ == '__main__':
-    import sys
-    import os
-    from datetime import datetime
-
-    # 修改参数处理，支持基于commits_data.json或直接指定仓库路径
-    if len(sys.argv) < 2:
-        print("使用方法:")
-        print("  python analyze_commits.py <仓库路径>")
-        print("  - 将基于已存在的 commits_data.json 进行分析")
-        print("  - 如果 commits_data.json 不存在，请先运行 collect_commits.py")
-        print("")
-        print("输出:")
-        print("  - analysis_result_with_diff.json 保存到 skill 目录")
-        sys.exit(1)
-
-    repo_path = sys.argv[1]
-
-    # 确定skill目录路径
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    skill_dir = os.path.dirname(script_dir)
-    commits_data_file = os.path.join(skill_dir, "commits_data.json")
+def analyze_commits_for_repos(commits: List[Dict], repo_paths_map: Dict[str, str]) -> Dict:
+    """
+    对一个或多个仓库的 commits 执行完整分析：去重、丰富、diff 提取、分组、统计
 
-    print("🔍 开始分析Git提交记录...")
+    多个仓库在同一次分析中一起按 patch-id 去重，跨仓库 cherry-pick 的副本
+    记录在规范条目的 aliases 中，不重复分析和统计
 
-    # 检查commits_data.json是否存在
-    if not os.path.exists(commits_data_file):
-        print(f"❌ 未找到 {commits_data_file}")
-        print("请先运行 collect_commits.py 收集提交数据")
-        sys.exit(1)
+    Args:
+        commits: 原始 commits 列表（collect_commits 的输出，需包含 repo 字段）
+        repo_paths_map: 仓库路径映射 {repo_name: repo_path}
 
-    # 读取commits数据
-    print(f"📊 读取提交数据: {commits_data_file}")
-    try:
-        with open(commits_data_file, 'r', encoding='utf-8') as f:
-            commits_data = json.load(f)
-    except Exception as e:
-        print(f"❌ 读取commits_data.json失败: {e}")
-        sys.exit(1)
+    Returns:
+        分析结果字典，即 analysis_result_with_diff.json 的内容
+    """
+    from collect_commits import dedupe_by_patch_id
 
-    # 添加repo信息
-    repo_name = os.path.basename(repo_path)
-    for commit in commits_data:
-        commit['repo'] = repo_name
+    print(f"📊 找到 {len(commits)} 个提交记录")
 
-    print(f"📊 找到 {len(commits_data)} 个提交记录")
+    # 按 patch-id 合并 cherry-pick / rebase 产生的重复提交（包括跨仓库的副本），避免重复分析和统计
+    commits = dedupe_by_patch_id(commits, repo_paths_map)
+    same_repo_duplicates = 0
+    cross_repo_duplicates = 0
+    for commit in commits:
+        for alias in commit.get('aliases', []):
+            if alias['repo'] == commit.get('repo', ''):
+                same_repo_duplicates += 1
+            else:
+                cross_repo_duplicates += 1
+    if same_repo_duplicates or cross_repo_duplicates:
+        print(f"🔁 合并重复提交: 同仓库 {same_repo_duplicates} 个，跨仓库 {cross_repo_duplicates} 个，"
+              f"剩余 {len(commits)} 个")
 
     # 丰富数据，包含diff分析
     print("🔄 正在分析提交数据...")
-    enriched = enrich_commits(commits_data, FALLBACK_MAPPING, {repo_name: repo_path})
+    enriched = enrich_commits(commits, FALLBACK_MAPPING, repo_paths_map)
 
     # 为每个commit添加diff信息
     print("🔄 正在提取diff信息...")
     for commit in enriched:
-        commit['diff_info'] = extract_commit_diff(commit, repo_path)
+        commit['diff_info'] = extract_commit_diff(commit, repo_paths_map.get(commit.get('repo', '')))
 
     # 分组
     grouped = group_by_project_and_category(enriched)
 
-    # 输出分析结果到skill目录
-    analysis_file = os.path.join(skill_dir, "analysis_result_with_diff.json")
-    result = {
+    return {
         'commits': enriched,
         'grouped': grouped,
         'stats': {
-            'total_commits': len(commits_data),
+            'total_commits': len(commits),
+            'duplicate_commits': same_repo_duplicates,
+            'cross_repo_duplicates': cross_repo_duplicates,
             'effective_commits': len([c for c in enriched if not c.get('_weak', False)]),
             'projects': list(grouped.keys())
         },
         'analysis_timestamp': datetime.now().isoformat(),
-        'repo_analyzed': repo_name
+        'repo_analyzed': ', '.join(repo_paths_map.keys()),
+        'repos_analyzed': list(repo_paths_map.keys())
     }
 
-    with open(analysis_file, 'w', encoding='utf-8') as f:
+
+def analyze_repo_commits(commits: List[Dict], repo_path: str) -> Dict:
+    """
+    对单个仓库的 commits 执行完整分析，见 analyze_commits_for_repos
+
+    Args:
+        commits: 原始 commits 列表（collect_commits 的输出）
+        repo_path: 仓库路径
+
+    Returns:
+        分析结果字典，即 analysis_result_with_diff.json 的内容
+    """
+    # 添加repo信息
+    repo_name = os.path.basename(os.path.abspath(repo_path))
+    for commit in commits:
+        commit['repo'] = repo_name
+
+    return analyze_commits_for_repos(commits, {repo_name: repo_path})
+
+
+def save_analysis_result(result: Dict, output_file: str) -> None:
+    """
+    将分析结果写入 JSON 文件
+    """
+    with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(result, f, ensure_ascii=False, indent=2)
 
-    print(f"✅ 分析完成，结果保存到: {analysis_file}")
 
-    # 输出统计信息到控制台
+def print_analysis_summary(result: Dict) -> None:
+    """
+    输出统计信息到控制台
+    """
+    grouped = result['grouped']
+
     print(f"📈 统计信息:")
     print(f"  - 总提交数: {result['stats']['total_commits']}")
     print(f"  - 有效提交数: {result['stats']['effective_commits']}")
+    print(f"  - 合并重复提交（同仓库）: {result['stats']['duplicate_commits']}")
+    print(f"  - 合并重复提交（跨仓库）: {result['stats']['cross_repo_duplicates']}")
     print(f"  - 涉及项目: {len(result['stats']['projects'])}")
 
     for project, categories in grouped.items():
@@ -611,4 +627,71 @@ if __name__ == '__main__':
         'stats': result['stats'],
         'projects_summary': {project: list(categories.keys()) for project, categories in grouped.items()}
     }
-    print(json.dumps(simplified_result, ensure_ascii=False, indent=2))
\ No newline at end of file
+    print(json.dumps(simplified_result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    import sys
+    from rollups import save_weekly_rollup
+
+    # 修改参数处理，支持基于commits_data.json或直接指定仓库路径
+    if len(sys.argv) < 2:
+        print("使用方法:")
+        print("  python analyze_commits.py <仓库路径>")
+        print("  - 将基于已存在的 commits_data.json 进行分析")
+        print("  - 如果 commits_data.json 不存在，请先运行 collect_commits.py")
+        print("  - 也可以直接运行 weekly_report.py 一次完成收集和分析")
+        print("")
+        print("输出:")
+        print("  - analysis_result_with_diff.json 保存到 skill 目录")
+        sys.exit(1)
+
+    repo_path = sys.argv[1]
+
+    # 确定skill目录路径
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    skill_dir = os.path.dirname(script_dir)
+    commits_data_file = os.path.join(skill_dir, "commits_data.json")
+
+    print("🔍 开始分析Git提交记录...")
+
+    # 检查commits_data.json是否存在
+    if not os.path.exists(commits_data_file):
+        print(f"❌ 未找到 {commits_data_file}")
+        print("请先运行 collect_commits.py 收集提交数据")
+        sys.exit(1)
+
+    # 读取commits数据
+    print(f"📊 读取提交数据: {commits_data_file}")
+    try:
+        with open(commits_data_file, 'r', encoding='utf-8') as f:
+            commits_data = json.load(f)
+    except Exception as e:
+        print(f"❌ 读取commits_data.json失败: {e}")
+        sys.exit(1)
+
+    # commits_data.json 记录了收集时实际使用的时间范围和作者，周汇总只覆盖该范围；
+    # 旧格式（提交列表）没有这些信息，无法确定覆盖范围，不更新周汇总
+    rollup_since, rollup_authors = None, None
+    if isinstance(commits_data, dict):
+        rollup_since = datetime.fromisoformat(commits_data['since'])
+        rollup_authors = commits_data.get('authors', {})
+        commits_data = commits_data['commits']
+
+    result = analyze_repo_commits(commits_data, repo_path)
+
+    # 输出分析结果到skill目录
+    analysis_file = os.path.join(skill_dir, "analysis_result_with_diff.json")
+    save_analysis_result(result, analysis_file)
+
+    print(f"✅ 分析完成，结果保存到: {analysis_file}")
+
+    # 保存周汇总，供多周趋势查询使用
+    repo_name = os.path.basename(os.path.abspath(repo_path))
+    if rollup_since is None or repo_name not in (rollup_authors or {}):
+        print("⚠️ commits_data.json 缺少收集时间范围或作者信息（请重新运行 collect_commits.py），未更新周汇总")
+    else:
+        for rollup_file in save_weekly_rollup(result, rollup_since, {repo_name: rollup_authors[repo_name]}):
+            print(f"📦 周汇总已保存到: {rollup_file}")
+
+    print_analysis_summary(result)
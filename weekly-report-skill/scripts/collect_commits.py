@@ -1,8 +1,12 @@
 import subprocess
 import os
-from typing import List, Dict, Tuple, Optional
+from typing import Iterator, List, Dict, Tuple, Optional
+from collections import defaultdict
 from datetime import datetime, timedelta
 
+# 默认收集最近多少天的提交
+DEFAULT_SINCE_DAYS = 7
+
 def get_git_config(repo_path: str) -> Tuple[Optional[str], Optional[str]]:
     """从目标仓库获取git配置的用户名和邮箱"""
     try:
@@ -26,28 +30,50 @@ def get_git_config(repo_path: str) -> Tuple[Optional[str], Optional[str]]:
         print(f"获取git配置失败: {e}")
         return None, None
 
-def get_commits(repo_path: str, author_email: str = None, since: datetime = None) -> List[Dict]:
-    """获取指定作者的 git commit，包含文件路径信息
+
+def resolve_author_email(repo_path: str, author_email: str = None) -> str:
+    """返回要收集的作者邮箱：指定时原样返回，否则从仓库git配置获取
+
+    Raises:
+        ValueError: 未指定邮箱且仓库未配置 user.email
+    """
+    if author_email is not None:
+        return author_email
+    _, email = get_git_config(repo_path)
+    if email is None:
+        raise ValueError("无法获取仓库git配置中的用户邮箱，请确保仓库已配置user.email")
+    return email
+
+
+def default_since() -> datetime:
+    """默认收集起点：DEFAULT_SINCE_DAYS 天前的零点
+
+    起点取整天，周汇总按天覆盖时第一天的数据也是完整的
+    """
+    return datetime.combine((datetime.now() - timedelta(days=DEFAULT_SINCE_DAYS)).date(), datetime.min.time())
+
+def iter_commits(repo_path: str, author_email: str = None, since: datetime = None) -> Iterator[Dict]:
+    """逐条产出指定作者的 git commit，包含文件路径信息
     只收集【用户本人】的提交记录，基于git配置的邮箱进行过滤
 
+    直接读取 git log 的输出流，解析出一个 commit 就立即交给调用方，
+    无需等待 git log 结束，也不需要先落盘成 JSON
+
     Args:
         repo_path: 仓库路径
         author_email: 作者邮箱，如果为None则从仓库配置自动获取
-        since: 起始时间，默认为7天前
+        since: 起始时间，默认为7天前的零点；只取日期部分，从当天零点开始收集
     """
     # 如果没有指定作者邮箱，从仓库配置获取
     if author_email is None:
-        _, email = get_git_config(repo_path)
-        if email is None:
-            raise ValueError("无法获取仓库git配置中的用户邮箱，请确保仓库已配置user.email")
-        author_email = email
+        author_email = resolve_author_email(repo_path)
         print(f"从仓库配置获取作者邮箱: {author_email}")
     else:
         print(f"使用指定的作者邮箱: {author_email}")
 
     # 如果没有指定时间范围，默认获取最近7天
     if since is None:
-        since = datetime.now() - timedelta(days=7)
+        since = default_since()
         print(f"获取时间范围: {since.strftime('%Y-%m-%d')} 至今")
 
     # 构建 git log 命令
@@ -58,53 +84,171 @@ def get_commits(repo_path: str, author_email: str = None, since: datetime = None
     ]
     
     # 如果指定了时间范围，添加 --since 参数
+    # 显式指定零点：只给日期时 git 会沿用当前时刻，第一天的提交会被截掉一部分
     if since:
-        cmd.extend(['--since', since.strftime('%Y-%m-%d')])
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    commits = []
-    lines = result.stdout.strip().split('\n')
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        if not line:
-            i += 1
-            continue
-            
-        # 解析 commit 信息
-        if '||' in line:
-            parts = line.split('||')
-            if len(parts) >= 5:
-                hash_, name, email, date, message = parts[0], parts[1], parts[2], parts[3], '||'.join(parts[4:])
-                
-                # 收集该 commit 涉及的文件路径
-                paths = []
-                i += 1
-                while i < len(lines) and lines[i].strip() and '||' not in lines[i]:
-                    path = lines[i].strip()
-                    if path:  # 忽略空行
-                        paths.append(path)
-                    i += 1
-                
-                # 二次验证：确保邮箱完全匹配（防止部分匹配问题）
-                if email.lower() == author_email.lower():
-                    commits.append({
-                        'hash': hash_,
-                        'author': name,
-                        'email': email,
-                        'date': date,
-                        'message': message,
-                        'paths': paths
-                    })
-                else:
-                    # 这种情况理论上不应该出现，但作为保险
-                    print(f"警告: 跳过不匹配的提交 {hash_[:8]} (邮箱: {email}, 期望: {author_email})")
+        cmd.extend(['--since', since.strftime('%Y-%m-%d 00:00')])
+
+    def build_commit(header: str, paths: List[str]) -> Optional[Dict]:
+        parts = header.split('||')
+        hash_, name, email, date, message = parts[0], parts[1], parts[2], parts[3], '||'.join(parts[4:])
+
+        # 二次验证：确保邮箱完全匹配（防止部分匹配问题）
+        if email.lower() != author_email.lower():
+            # 这种情况理论上不应该出现，但作为保险
+            print(f"警告: 跳过不匹配的提交 {hash_[:8]} (邮箱: {email}, 期望: {author_email})")
+            return None
+
+        return {
+            'hash': hash_,
+            'author': name,
+            'email': email,
+            'date': date,
+            'message': message,
+            'paths': paths
+        }
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        header = None
+        paths = []
+        for raw_line in proc.stdout:
+            line = raw_line.strip()
+            if not line:  # 忽略空行
                 continue
-        i += 1
-    
-    return commits
+
+            # 解析 commit 信息
+            if '||' in line and len(line.split('||')) >= 5:
+                if header is not None:
+                    commit = build_commit(header, paths)
+                    if commit is not None:
+                        yield commit
+                header = line
+                paths = []
+            elif header is not None:
+                # 收集该 commit 涉及的文件路径
+                paths.append(line)
+
+        if header is not None:
+            commit = build_commit(header, paths)
+            if commit is not None:
+                yield commit
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+def get_commits(repo_path: str, author_email: str = None, since: datetime = None) -> List[Dict]:
+    """获取指定作者的 git commit，包含文件路径信息
+    只收集【用户本人】的提交记录，基于git配置的邮箱进行过滤
+
+    Args:
+        repo_path: 仓库路径
+        author_email: 作者邮箱，如果为None则从仓库配置自动获取
+        since: 起始时间，默认为7天前
+    """
+    return list(iter_commits(repo_path, author_email, since))
+
+def compute_patch_ids(repo_path: str, hashes: List[str]) -> Dict[str, str]:
+    """批量计算 commit 的 patch-id（git patch-id --stable）
+
+    所有 commit 通过一条管道一次性处理：
+    git log --no-walk --stdin -p | git patch-id --stable
+    merge 提交和空提交没有 patch，不会出现在结果中
+
+    Args:
+        repo_path: 仓库路径
+        hashes: commit hash 列表
+
+    Returns:
+        {commit hash: patch-id}
+    """
+    if not hashes:
+        return {}
+
+    log_cmd = [
+        'git', '-C', repo_path, 'log', '--no-walk=unsorted', '--stdin',
+        '-p', '--format=commit %H'
+    ]
+    patch_id_cmd = ['git', '-C', repo_path, 'patch-id', '--stable']
+
+    patch_ids = {}
+    try:
+        log_proc = subprocess.Popen(log_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL)
+        patch_id_proc = subprocess.Popen(patch_id_cmd, stdin=log_proc.stdout, stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL, text=True)
+        # 交由 patch-id 进程读取，父进程不再持有该管道
+        log_proc.stdout.close()
+
+        # git log --stdin 会先读完全部输入再输出，一次写入不会阻塞
+        log_proc.stdin.write('\n'.join(hashes).encode() + b'\n')
+        log_proc.stdin.close()
+
+        output, _ = patch_id_proc.communicate()
+        log_proc.wait()
+
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                patch_id, hash_ = parts
+                patch_ids[hash_] = patch_id
+    except Exception as e:
+        print(f"计算patch-id失败: {e}")
+
+    return patch_ids
+
+def dedupe_by_patch_id(commits: List[Dict], repo_paths_map: Dict[str, str] = None) -> List[Dict]:
+    """按 patch-id 合并 cherry-pick / rebase 产生的重复提交
+
+    每个仓库只调用一次 compute_patch_ids，之后跨仓库按 patch-id 分组。
+    同一 patch 只保留第一次出现的提交作为规范条目，其余提交记录在
+    规范条目的 aliases 字段中，不再参与后续的 diff 和代码片段提取
+
+    Args:
+        commits: 原始 commits 列表（需包含 repo 字段以定位仓库路径）
+        repo_paths_map: 仓库路径映射 {repo_name: repo_path}
+
+    Returns:
+        去重后的 commits 列表，保持原有顺序
+    """
+    if not repo_paths_map:
+        return commits
+
+    # 按仓库分组，每个仓库一次批量计算
+    hashes_by_repo = defaultdict(list)
+    for commit in commits:
+        repo_name = commit.get('repo', '')
+        if repo_name in repo_paths_map and commit.get('hash'):
+            hashes_by_repo[repo_name].append(commit['hash'])
+
+    patch_ids_by_repo = {
+        repo_name: compute_patch_ids(repo_paths_map[repo_name], hashes)
+        for repo_name, hashes in hashes_by_repo.items()
+    }
+
+    canonical = {}
+    deduped = []
+    for commit in commits:
+        patch_id = patch_ids_by_repo.get(commit.get('repo', ''), {}).get(commit.get('hash', ''))
+        if patch_id is None:
+            # 没有 patch-id（merge 提交等）时原样保留
+            deduped.append(commit)
+            continue
+
+        if patch_id in canonical:
+            canonical[patch_id].setdefault('aliases', []).append({
+                'hash': commit['hash'],
+                'repo': commit.get('repo', ''),
+                'date': commit.get('date', ''),
+                'message': commit.get('message', '')
+            })
+            continue
+
+        commit['patch_id'] = patch_id
+        canonical[patch_id] = commit
+        deduped.append(commit)
+
+    return deduped
+
 
 if __name__ == '__main__':
     import sys
@@ -125,8 +269,16 @@ if __name__ == '__main__':
     repo_path = sys.argv[1]
     author_email = sys.argv[2] if len(sys.argv) == 3 else None
 
-    # 获取提交记录，如果未指定作者和时间，函数内部会自动设置默认值
-    commits = get_commits(repo_path, author_email)
+    # 提前确定作者和时间范围，一并写入 commits_data.json，供生成周汇总时使用
+    try:
+        author_email = resolve_author_email(repo_path, author_email)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    since = default_since()
+    print(f"获取时间范围: {since.strftime('%Y-%m-%d')} 至今")
+
+    commits = get_commits(repo_path, author_email, since)
 
     print(f"找到 {len(commits)} 个提交记录")
 
@@ -138,7 +290,11 @@ if __name__ == '__main__':
 
     # 输出JSON格式的数据到skill目录
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(commits, f, ensure_ascii=False, indent=2)
+        json.dump({
+            'since': since.isoformat(),
+            'authors': {os.path.basename(os.path.abspath(repo_path)): author_email},
+            'commits': commits
+        }, f, ensure_ascii=False, indent=2)
 
     print(f"提交数据已保存到: {output_file}")
 
@@ -0,0 +1,269 @@
+"""
+周维度汇总（rollup）存储与趋势查询
+
+每次生成周报时，把分析结果按 提交所在周 / 项目 / 工作类型 预先汇总保存到
+skill 目录下的 rollups/<ISO周>.json 中：提交数、有效提交数（非弱化）、
+代码改动量（churn = 新增行数 + 删除行数）以及改动最多的文件。
+汇总按 仓库 / 作者 / 日期 分开存放，不同作者在同一仓库上生成周报互不覆盖。
+多周趋势（如"最近 8 周按项目和分类"）直接读取这些汇总文件，无需重新收集和分析 git 历史。
+"""
+import json
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+
+# 汇总文件格式版本
+ROLLUP_VERSION = 3
+
+# 每个 项目/分类 保留的改动最多文件数量
+TOP_FILES_LIMIT = 10
+
+ROLLUP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'rollups')
+
+
+def week_key(date: datetime = None) -> str:
+    """
+    返回 ISO 周标识，如 2026-W42
+    """
+    date = date or datetime.now()
+    year, week, _ = date.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _new_bucket() -> Dict:
+    return {
+        'commits': 0,
+        'effective_commits': 0,
+        'additions': 0,
+        'deletions': 0,
+        'churn': 0,
+        'top_files': []
+    }
+
+
+def _merge_bucket(target: Dict, source: Dict, file_churn: Counter) -> None:
+    for field in ('commits', 'effective_commits', 'additions', 'deletions', 'churn'):
+        target[field] += source.get(field, 0)
+    for file_path, churn in source.get('top_files', []):
+        file_churn[file_path] += churn
+
+
+def parse_commit_date(date: str) -> Optional[datetime]:
+    """
+    解析 git log %ad 默认格式的提交时间，如 'Mon Oct 19 19:30:52 2026 +0800'，并转换为本地时间
+
+    与 git log --since 一致按本地时间划分日期
+    """
+    try:
+        return datetime.strptime(date, '%a %b %d %H:%M:%S %Y %z').astimezone().replace(tzinfo=None)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_daily_rollup(result: Dict) -> Dict[str, Dict[str, Dict[str, Dict[str, Dict]]]]:
+    """
+    从分析结果（analysis_result_with_diff.json 的内容）按仓库和提交日期构建汇总
+
+    Args:
+        result: analyze_commits_for_repos 的返回值
+
+    Returns:
+        {仓库名: {日期 YYYY-MM-DD: {项目名: {分类: {commits, effective_commits, additions, deletions, churn, top_files}}}}}
+    """
+    buckets = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
+    file_churn = defaultdict(Counter)
+    default_repo = result.get('repo_analyzed', '')
+
+    for project, categories in result.get('grouped', {}).items():
+        for category, commits in categories.items():
+            for commit in commits:
+                commit_time = parse_commit_date(commit.get('date', ''))
+                if commit_time is None:
+                    print(f"⚠️ 无法解析提交 {commit.get('hash', '')[:8]} 的时间 {commit.get('date')!r}，不计入周汇总")
+                    continue
+
+                repo = commit.get('repo') or default_repo
+                day = commit_time.strftime('%Y-%m-%d')
+                bucket = buckets[repo][day][project].setdefault(category, _new_bucket())
+                bucket['commits'] += 1
+                if not commit.get('_weak', False):
+                    bucket['effective_commits'] += 1
+
+                for diff in commit.get('diff_info', []):
+                    additions = diff.get('additions', 0)
+                    deletions = diff.get('deletions', 0)
+                    bucket['additions'] += additions
+                    bucket['deletions'] += deletions
+                    bucket['churn'] += additions + deletions
+                    file_churn[(repo, day, project, category)][diff.get('file_path', '')] += additions + deletions
+
+    for (repo, day, project, category), counter in file_churn.items():
+        buckets[repo][day][project][category]['top_files'] = [
+            [path, churn] for path, churn in counter.most_common(TOP_FILES_LIMIT)
+        ]
+
+    return {repo: {day: dict(projects) for day, projects in days.items()} for repo, days in buckets.items()}
+
+
+def _load_rollup_file(rollup_file: str) -> Optional[Dict]:
+    """
+    读取周汇总文件，文件不存在、损坏或格式版本不匹配时返回 None
+    """
+    if not os.path.exists(rollup_file):
+        return None
+
+    try:
+        with open(rollup_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"⚠️ 读取周汇总 {rollup_file} 失败: {e}")
+        return None
+
+    if data.get('version') != ROLLUP_VERSION:
+        print(f"⚠️ 周汇总 {rollup_file} 格式版本不匹配，已忽略")
+        return None
+    return data
+
+
+def save_weekly_rollup(result: Dict, since: datetime, authors: Dict[str, str],
+                       rollup_dir: str = None) -> List[str]:
+    """
+    按提交所在的 ISO 周保存汇总到 rollups/<week>.json
+
+    周报收集的是滚动时间窗口（默认最近 7 天），通常跨两个 ISO 周，因此按每个提交自己的日期归入对应周。
+    文件内按 仓库 / 作者 / 日期 存放：只覆盖本次时间窗口内（since 当天至今天）该仓库、该作者的日期，
+    窗口之外的日期和其他作者的数据保留不变，重复生成周报不会重复累计，也不会丢失更早的数据
+
+    Args:
+        result: analyze_commits_for_repos 的返回值
+        since: 本次收集实际使用的起始时间（collect_commits 从当天零点开始收集）
+        authors: 本次收集的作者邮箱 {仓库名: 作者邮箱}，没有提交的仓库也需要列出，以便清空窗口内的旧数据
+        rollup_dir: 汇总文件目录，默认为 skill 目录下的 rollups/
+
+    Returns:
+        本次更新的汇总文件路径列表
+    """
+    rollup_dir = rollup_dir or ROLLUP_DIR
+    today = datetime.now().date()
+
+    daily = build_daily_rollup(result)
+
+    # 本次时间窗口覆盖的日期，按周分组
+    covered = defaultdict(list)
+    day = since.date()
+    while day <= today:
+        covered[week_key(datetime.combine(day, datetime.min.time()))].append(day.strftime('%Y-%m-%d'))
+        day += timedelta(days=1)
+
+    os.makedirs(rollup_dir, exist_ok=True)
+    rollup_files = []
+    for week, days in covered.items():
+        rollup_file = os.path.join(rollup_dir, f"{week}.json")
+        data = _load_rollup_file(rollup_file) or {'version': ROLLUP_VERSION, 'week': week, 'repos': {}}
+
+        for repo, author in authors.items():
+            author_days = data['repos'].setdefault(repo, {}).setdefault(author, {})
+            for covered_day in days:
+                author_days.pop(covered_day, None)
+                if covered_day in daily.get(repo, {}):
+                    author_days[covered_day] = daily[repo][covered_day]
+        data['updated_at'] = datetime.now().isoformat()
+
+        with open(rollup_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        rollup_files.append(rollup_file)
+
+    return rollup_files
+
+
+def load_trend(weeks: int = 8, end: datetime = None, rollup_dir: str = None) -> Dict[str, Dict[str, Dict[str, Dict]]]:
+    """
+    读取最近若干周的汇总，合并各仓库、各作者、各日期的数据
+
+    Args:
+        weeks: 周数
+        end: 截止日期（含该日期所在周），默认为今天
+        rollup_dir: 汇总文件目录，默认为 skill 目录下的 rollups/
+
+    Returns:
+        {周: {项目名: {分类: 汇总}}}，按周升序；没有汇总数据的周为空字典
+    """
+    rollup_dir = rollup_dir or ROLLUP_DIR
+    end = end or datetime.now()
+
+    trend = {}
+    for offset in range(weeks - 1, -1, -1):
+        week = week_key(end - timedelta(weeks=offset))
+        trend[week] = {}
+
+        data = _load_rollup_file(os.path.join(rollup_dir, f"{week}.json"))
+        if data is None:
+            continue
+
+        merged = defaultdict(lambda: defaultdict(_new_bucket))
+        file_churn = defaultdict(Counter)
+        for repo_authors in data.get('repos', {}).values():
+            for author_days in repo_authors.values():
+                for projects in author_days.values():
+                    for project, categories in projects.items():
+                        for category, bucket in categories.items():
+                            _merge_bucket(merged[project][category], bucket, file_churn[(project, category)])
+
+        for (project, category), counter in file_churn.items():
+            merged[project][category]['top_files'] = [
+                [path, churn] for path, churn in counter.most_common(TOP_FILES_LIMIT)
+            ]
+
+        trend[week] = {project: dict(categories) for project, categories in merged.items()}
+
+    return trend
+
+
+def format_trend_table(trend: Dict[str, Dict[str, Dict[str, Dict]]]) -> str:
+    """
+    将趋势数据格式化为 Markdown 表格（每行一个 项目/分类，每列一周的有效提交数/churn）
+    """
+    weeks = list(trend.keys())
+    rows = sorted({(project, category)
+                   for projects in trend.values()
+                   for project, categories in projects.items()
+                   for category in categories})
+
+    lines = [
+        '| 项目 | 分类 | ' + ' | '.join(weeks) + ' |',
+        '|------|------|' + '|'.join(['------'] * len(weeks)) + '|'
+    ]
+    for project, category in rows:
+        cells = []
+        for week in weeks:
+            bucket = trend[week].get(project, {}).get(category)
+            cells.append(f"{bucket['effective_commits']} / {bucket['churn']}" if bucket else '-')
+        lines.append(f"| {project} | {category} | " + ' | '.join(cells) + ' |')
+
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) > 2 or (len(sys.argv) == 2 and not sys.argv[1].isdigit()):
+        print("使用方法: python rollups.py [周数]")
+        print("示例: python rollups.py 8")
+        print("")
+        print("说明:")
+        print("  - 读取 rollups/ 目录下的周汇总，输出最近 N 周（默认 8 周）按项目和分类的趋势")
+        print("  - 表格单元格格式为: 有效提交数 / 代码改动行数(churn)")
+        print("  - 周汇总在每次运行 analyze_commits.py 或 weekly_report.py 时自动生成")
+        sys.exit(1)
+
+    weeks = int(sys.argv[1]) if len(sys.argv) == 2 else 8
+    trend = load_trend(weeks)
+
+    if not any(trend.values()):
+        print(f"❌ 最近 {weeks} 周没有周汇总数据，请先生成周报")
+        sys.exit(1)
+
+    print(f"📈 最近 {weeks} 周趋势（有效提交数 / churn）:\n")
+    print(format_trend_table(trend))
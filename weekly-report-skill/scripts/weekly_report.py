@@ -0,0 +1,90 @@
+"""
+周报数据一体化入口：收集 + 分析在同一进程内完成
+
+collect_commits.iter_commits 产出的提交直接在内存中交给 analyze_commits_for_repos，
+不再经过 commits_data.json 的写入与重新解析，也省去第二个解释器的启动。
+一次指定多个仓库时，跨仓库 cherry-pick 的副本在同一次分析中按 patch-id 合并。
+"""
+import argparse
+import json
+import os
+import sys
+
+from collect_commits import iter_commits, resolve_author_email, default_since
+from analyze_commits import analyze_commits_for_repos, save_analysis_result, print_analysis_summary
+from rollups import save_weekly_rollup
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='收集并分析 Git 提交记录，生成 analysis_result_with_diff.json')
+    parser.add_argument('repo_paths', nargs='+', metavar='repo_path',
+                        help='仓库路径，可指定多个；最后一个参数为邮箱时视为作者邮箱（兼容旧用法）')
+    parser.add_argument('--author', dest='author_email', default=None,
+                        help='作者邮箱，不指定时从各仓库git配置中获取')
+    parser.add_argument('--dump-commits', action='store_true',
+                        help='同时输出中间结果 commits_data.json（默认不输出）')
+    parser.add_argument('--print-commits', action='store_true',
+                        help='在控制台逐条打印收集到的提交（默认不打印）')
+    args = parser.parse_args()
+
+    # 兼容旧用法: weekly_report.py <仓库路径> <作者邮箱>
+    if len(args.repo_paths) > 1 and '@' in args.repo_paths[-1] and not os.path.isdir(args.repo_paths[-1]):
+        if args.author_email is None:
+            args.author_email = args.repo_paths[-1]
+        args.repo_paths = args.repo_paths[:-1]
+
+    # 确定skill目录路径
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    skill_dir = os.path.dirname(script_dir)
+
+    print("🔍 开始收集Git提交记录...")
+    since = default_since()
+    commits = []
+    repo_paths_map = {}
+    authors = {}
+    for repo_path in args.repo_paths:
+        repo_name = os.path.basename(os.path.abspath(repo_path))
+        if repo_name in repo_paths_map:
+            print(f"❌ 仓库目录名重复: {repo_name}（{repo_paths_map[repo_name]} 与 {repo_path}）")
+            sys.exit(1)
+        repo_paths_map[repo_name] = repo_path
+
+        try:
+            authors[repo_name] = resolve_author_email(repo_path, args.author_email)
+            for commit in iter_commits(repo_path, args.author_email, since):
+                commit['repo'] = repo_name
+                if args.print_commits:
+                    print(f"[{repo_name}] [{commit['date']}] {commit['message']} ({len(commit['paths'])} files)")
+                commits.append(commit)
+        except ValueError as e:
+            print(f"❌ {repo_path}: {e}")
+            sys.exit(1)
+
+    if args.dump_commits:
+        commits_data_file = os.path.join(skill_dir, "commits_data.json")
+        with open(commits_data_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'since': since.isoformat(),
+                'authors': authors,
+                'commits': commits
+            }, f, ensure_ascii=False)
+        print(f"提交数据已保存到: {commits_data_file}")
+
+    print("🔍 开始分析Git提交记录...")
+    result = analyze_commits_for_repos(commits, repo_paths_map)
+
+    # 输出分析结果到skill目录
+    analysis_file = os.path.join(skill_dir, "analysis_result_with_diff.json")
+    save_analysis_result(result, analysis_file)
+
+    print(f"✅ 分析完成，结果保存到: {analysis_file}")
+
+    # 保存周汇总，供多周趋势查询使用
+    for rollup_file in save_weekly_rollup(result, since, authors):
+        print(f"📦 周汇总已保存到: {rollup_file}")
+
+    print_analysis_summary(result)
+
+
+if __name__ == '__main__':
+    main()